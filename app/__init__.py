@@ -6,20 +6,46 @@ from typing import Any, Dict
 
 from flask import Flask, jsonify, g, request
 from flask_cors import CORS
+from sqlalchemy import event
 
 from app.extensions import db, migrate
+from app.lib.utils.json_provider import ORJSONProvider
 from app.auth.routes.auth_routes import auth_bp
 from app.auth.utils.jwt import decode_jwt, get_bearer_token
 from app.product.routes.product_routes import product_bp
 from app.mine.routes.mine_routes import mine_bp
 
 
+# WAL lets readers run alongside the writer; synchronous=NORMAL fsyncs at
+# checkpoints instead of on every commit. Tests keep the default FULL.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _sqlite_on_connect(testing: bool):
+    pragmas = _SQLITE_PRAGMAS + (("PRAGMA synchronous=FULL",) if testing else ("PRAGMA synchronous=NORMAL",))
+
+    def _on_connect(dbapi_conn, _record) -> None:
+        cursor = dbapi_conn.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return _on_connect
+
+
 def create_app(config_object: str | None = None) -> Flask:
     """
     Application Factory.
     Select config class via env var APP_CONFIG (fallback to 'config.Config').
     """
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
     config_object = config_object or os.getenv("APP_CONFIG", "config.Config")
     app.config.from_object(config_object)
@@ -29,6 +55,11 @@ def create_app(config_object: str | None = None) -> Flask:
     migrate.init_app(app, db)
     CORS(app, resources={r"/api/*": {"origins": app.config.get("CORS_ORIGINS", "*")}})
 
+    # ---- SQLite pragmas, applied to every new DBAPI connection ----
+    if str(app.config.get("SQLALCHEMY_DATABASE_URI", "")).startswith("sqlite"):
+        with app.app_context():
+            event.listen(db.engine, "connect", _sqlite_on_connect(app.testing))
+
     # ---- logging (simple sane defaults) ----
     if not app.debug and not app.testing:
         handler = logging.StreamHandler()
@@ -10,14 +10,13 @@ __version__ = "1.0.0"
 __author__ = "HQ Development Team"
 
 # Imports principais
-from .repository import BaseRepository, RepositoryMixin
+from .repository import BaseRepository
 from .services import BaseService
 from .utils import ValidationUtils, StringUtils
 from .base_model import BaseModel
 
 __all__ = [
     'BaseRepository',
-    'RepositoryMixin',
     'BaseService', 
     'ValidationUtils',
     'StringUtils',
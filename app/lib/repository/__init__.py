@@ -1,12 +1,11 @@
 from .base import BaseRepository
-from .mixins import RepositoryMixin, SearchMixin, AuditMixin
-from .decorators import transactional, cached_result
+from .mixins import FilterableRepositoryMixin
+from .decorators import transactional
+from .pagination import Page
 
 __all__ = [
     'BaseRepository',
-    'RepositoryMixin',
-    'SearchMixin',
-    'AuditMixin',
+    'FilterableRepositoryMixin',
     'transactional',
-    'cached_result'
+    'Page'
 ]
\ No newline at end of file
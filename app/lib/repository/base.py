@@ -17,7 +17,7 @@ from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar,
 from flask_sqlalchemy import SQLAlchemy
 from flask_sqlalchemy.model import Model  # <- **static type, not a variable**
 from sqlalchemy import and_, or_, select, func, text
-from sqlalchemy.orm import with_for_update
+from sqlalchemy import exists as sa_exists
 from sqlalchemy.exc import IntegrityError as SQLIntegrityError
 
 # --------------------------------------------------------------------------- #
@@ -53,6 +53,9 @@ class BaseRepository(Generic[M], ABC):
         self.model_class: Type[M] = model_class
         self.session = db.session
 
+        # static for the model's lifetime: resolve once instead of hasattr() per query
+        self._soft_delete: bool = self.ENABLE_SOFT_DELETE and hasattr(model_class, "deleted_at")
+
         # in‑memory registry of event hooks
         self._hooks: Dict[str, List[HookT]] = {
             "before_create": [],
@@ -122,7 +125,7 @@ class BaseRepository(Generic[M], ABC):
         try:
             self._fire("before_delete", entity)
 
-            if self.ENABLE_SOFT_DELETE and hasattr(entity, "deleted_at"):
+            if self._soft_delete:
                 entity.deleted_at = datetime.utcnow()
                 if self.ENABLE_AUDIT:
                     for k, v in self._audit_fields("delete").items():
@@ -139,7 +142,7 @@ class BaseRepository(Generic[M], ABC):
             raise self._translate_db_error(exc, "delete") from exc
 
     def restore(self, entity_id: Union[int, str]) -> bool:
-        if not (self.ENABLE_SOFT_DELETE and hasattr(self.model_class, "deleted_at")):
+        if not self._soft_delete:
             return False
 
         try:
@@ -173,12 +176,12 @@ class BaseRepository(Generic[M], ABC):
 
     def get_active(self) -> List[M]:
         query = self.model_class.query
-        if self.ENABLE_SOFT_DELETE and hasattr(self.model_class, "deleted_at"):
+        if self._soft_delete:
             query = query.filter(self.model_class.deleted_at.is_(None))
         return query.all()
 
     def get_deleted(self) -> List[M]:
-        if not (self.ENABLE_SOFT_DELETE and hasattr(self.model_class, "deleted_at")):
+        if not self._soft_delete:
             return []
         return self.model_class.query.filter(
             self.model_class.deleted_at.is_not(None)
@@ -188,7 +191,7 @@ class BaseRepository(Generic[M], ABC):
         self, criteria: Dict[str, Any], operator: str = "AND"
     ) -> List[M]:
         query = self.model_class.query
-        if self.ENABLE_SOFT_DELETE and hasattr(self.model_class, "deleted_at"):
+        if self._soft_delete:
             query = query.filter(self.model_class.deleted_at.is_(None))
 
         conditions = []
@@ -259,7 +262,7 @@ class BaseRepository(Generic[M], ABC):
     
     def list_paginated(self, page: int = 1, per_page: int = 20, filters: dict | None = None):
         query = self.model_class.query
-        if self.ENABLE_SOFT_DELETE and hasattr(self.model_class, "deleted_at"):
+        if self._soft_delete:
             query = query.filter(self.model_class.deleted_at.is_(None))
         if filters:
             for f, v in filters.items():
@@ -280,3 +283,15 @@ class BaseRepository(Generic[M], ABC):
             if hasattr(self.model_class, f):
                 query = query.filter(getattr(self.model_class, f) == v)
         return query.count()
+
+    def exists(self, **criteria) -> bool:
+        """
+        `count(**criteria) > 0` without counting: EXISTS stops at the first matching row.
+        Criteria must name table columns; an unknown key raises instead of widening the check.
+        """
+        columns = self.model_class.__table__.c
+        unknown = sorted(f for f in criteria if f not in columns)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        conds = [columns[f] == v for f, v in criteria.items()]
+        return bool(self.session.execute(select(sa_exists().select_from(self.model_class).where(*conds))).scalar())
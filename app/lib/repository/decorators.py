@@ -4,20 +4,32 @@ from typing import Callable
 
 from app.extensions import db
 
+# Nesting depth of @transactional calls, kept in the (request-scoped) session's info dict
+_DEPTH_KEY = "_transactional_depth"
+
 
 def transactional(fn: Callable):
     """Abre transação, faz commit no sucesso e rollback em exceção.
     Pode ser usado em Services que orquestram múltiplos repositories.
+    Reentrante: chamadas aninhadas reutilizam a transação externa; só a
+    chamada mais externa faz commit/rollback.
     """
 
     @wraps(fn)
     def wrapper(*args, **kwargs):
+        info = db.session.info
+        depth = info.get(_DEPTH_KEY, 0)
+        info[_DEPTH_KEY] = depth + 1
         try:
             result = fn(*args, **kwargs)
-            db.session.commit()
+            if depth == 0:
+                db.session.commit()
             return result
         except Exception:
-            db.session.rollback()
+            if depth == 0:
+                db.session.rollback()
             raise
+        finally:
+            info[_DEPTH_KEY] = depth
 
     return wrapper
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Page:
+    """One page of repository results (shared by the concrete repositories)."""
+
+    items: list
+    total: Optional[int]  # None when no COUNT is run (cursor mode / need_total=False)
+    page: int
+    per_page: int
+    pages: Optional[int]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
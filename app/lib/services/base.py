@@ -14,6 +14,7 @@ and uniform error envelopes.
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 from datetime import datetime
@@ -309,7 +310,9 @@ class BaseService:
     ):
         if self.repository is None:
             raise ValueError("Repository not configured")
-        key = f"paginate:{page}:{per_page}:{tuple(sorted(filters.items()))}"
+        # Stable across processes (no salted hash()), and short
+        canonical = repr((page, per_page, sorted(filters.items())))
+        key = f"paginate:{hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()}"
         cached = self._cache_get(key)
         if cached is not None:
             return cached
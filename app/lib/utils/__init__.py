@@ -1,9 +1,12 @@
 from .validators import ValidationUtils
 from .helpers import StringUtils, DateUtils, NumberUtils
+from .request_cache import request_cache, invalidate_request_cache
 
 __all__ = [
     'ValidationUtils',
     'StringUtils',
     'DateUtils',
-    'NumberUtils'
+    'NumberUtils',
+    'request_cache',
+    'invalidate_request_cache'
 ]
\ No newline at end of file
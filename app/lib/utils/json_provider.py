@@ -0,0 +1,55 @@
+"""
+orjson-backed JSON provider for Flask
+=====================================
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+
+def _default(obj: Any) -> Any:
+    """
+    Types orjson does not serialise natively, encoded as Flask's default provider
+    does: dates as HTTP dates (RFC 822), Decimal as str (no float rounding).
+    UUID/dataclass are native and already match.
+    """
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """Drop-in replacement for Flask's default provider (``app.json``)."""
+
+    # numpy arrays/scalars (plotly/narwhals payloads) are encoded natively instead of via _default;
+    # datetimes are passed through to _default to keep Flask's wire format
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        # pretty-print in debug, like Flask's default provider
+        option = self.option | orjson.OPT_INDENT_2 if self._app.debug else self.option
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option),
+            mimetype="application/json",
+        )
@@ -0,0 +1,42 @@
+"""
+Per-request memo for read-mostly lookups
+========================================
+
+Repositories memoize cheap reads on flask.g for the rest of the request.
+Everything is dropped on any write: after a flush, after a rollback and on
+bulk INSERT/UPDATE/DELETE statements (which bypass the flush). The Session
+listeners are registered once, here, for every user of the cache.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_G_KEY = "_request_cache"
+
+
+def request_cache(namespace: str) -> Optional[Dict[Any, Any]]:
+    """Memo dict for `namespace`, stored on flask.g (None outside an app context)."""
+    if not has_app_context():
+        return None
+    return g.setdefault(_G_KEY, {}).setdefault(namespace, {})
+
+
+def invalidate_request_cache(*_: Any) -> None:
+    """Drop every namespace; any write may change what a memoized lookup would return."""
+    if has_app_context():
+        g.pop(_G_KEY, None)
+
+
+event.listen(Session, "after_flush", invalidate_request_cache)
+event.listen(Session, "after_soft_rollback", invalidate_request_cache)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        invalidate_request_cache()
@@ -17,7 +17,7 @@ Special Features:
 from flask import Blueprint
 
 # Import routes and services
-from app.mine.routes import mine_bp
+from app.mine.routes.mine_routes import mine_bp
 from app.mine.services import MineService
 from app.mine.repository.mine_repository import SQLAlchemyMineRepository
 
@@ -8,16 +8,19 @@ from sqlalchemy import asc, desc, or_, select
 from sqlalchemy.orm import Session
 
 from app.extensions import db
+from app.lib.repository.pagination import Page
 from app.models.mine import Mine
 
 
-@dataclass
-class Page:
-    items: list
-    total: int
-    page: int
-    per_page: int
-    pages: int
+# Whitelisted sort columns, built once (unknown fields fall back to id)
+_SORT_FIELDS = {
+    "id": Mine.id,
+    "name": Mine.name,
+    "code": Mine.code,
+    "country": Mine.country,
+    "created_at": Mine.created_at,
+    "updated_at": Mine.updated_at,
+}
 
 
 @dataclass
@@ -59,7 +62,7 @@ class SQLAlchemyMineRepository:
 
     def _apply_sort(self, stmt: Any, sort: MineSort | None) -> Any:
         sort = sort or MineSort()
-        col = getattr(Mine, sort.field, Mine.id)
+        col = _SORT_FIELDS.get(sort.field, Mine.id)
         direction = asc if (sort.direction or "asc").lower() == "asc" else desc
         return stmt.order_by(direction(col))
 
@@ -8,6 +8,9 @@ from app.mine.services.mine_service import MineService
 
 mine_bp = Blueprint("mines", __name__, url_prefix="/api/mines")
 
+# Upper bound for ?per_page=
+MAX_PER_PAGE = 200
+
 
 # ----------------- small request helpers (local) -----------------
 def _bool(arg_val: str | None, default: bool = False) -> bool:
@@ -16,14 +19,9 @@ def _bool(arg_val: str | None, default: bool = False) -> bool:
     return arg_val.lower() in {"1", "true", "t", "yes", "y"}
 
 def _pagination() -> Tuple[int, int]:
-    try:
-        page = int(request.args.get("page", 1))
-    except Exception:  # noqa: BLE001
-        page = 1
-    try:
-        per_page = int(request.args.get("per_page", 20))
-    except Exception:  # noqa: BLE001
-        per_page = 20
+    # type=int falls back to the default on malformed input (no exception path)
+    page = request.args.get("page", default=1, type=int)
+    per_page = min(request.args.get("per_page", default=20, type=int), MAX_PER_PAGE)
     return page, per_page
 
 def _filters() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from collections import Counter
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.extensions import db
@@ -12,6 +14,7 @@ from app.mine.repository.mine_repository import (
     MineFilter,
     MineSort,
 )
+from app.product.repository.product_repository import ProductRepository
 
 
 class MineService(BaseService):
@@ -23,6 +26,7 @@ class MineService(BaseService):
         super().__init__()
         self.session = session or db.session
         self.repository = SQLAlchemyMineRepository(self.session)
+        self.product_repository = ProductRepository(self.session)
 
     # ------------------- read ops -------------------
     def list_mines(
@@ -64,17 +68,89 @@ class MineService(BaseService):
     def create_mine(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         # minimal validation
         errs = self.validate_required(payload, ["name"])
+        errs += self._validate_products(None, payload)
         if errs:
             return self.validation_error(errs)
 
         entity = self.repository.create(payload)
+        errs = self._sync_products(entity.id, payload)
+        if errs:
+            return self.validation_error(errs)
         return self.ok("Created", data=entity.to_dict())
 
     @transactional
     def update_mine(self, mine_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        errs = self._validate_products(mine_id, payload)
+        if errs:
+            return self.validation_error(errs)
         entity = self.repository.update_fields(mine_id, payload)
+        errs = self._sync_products(entity.id, payload)
+        if errs:
+            return self.validation_error(errs)
         return self.ok("Updated", data=entity.to_dict())
 
+    # ------------------- helpers -------------------
+    def _validate_products(self, mine_id: Optional[int], payload: Dict[str, Any]) -> List[str]:
+        """
+        Checks the nested `products` rows before anything is written:
+        ids must be products of this mine (the upsert would otherwise insert a
+        copy), rows that will be inserted need a name, and codes must not repeat
+        in the batch or belong to another mine's product.
+        """
+        rows = list(enumerate(payload.get("products") or []))
+        errors: List[str] = []
+        ids: Dict[int, Any] = {}
+        for idx, item in rows:
+            pid = item.get("id")
+            if not pid:
+                continue
+            if not isinstance(pid, int) or isinstance(pid, bool):
+                errors.append(f"Product {idx}: Field 'id' must be of type int")
+            else:
+                ids[idx] = pid
+        owned = self.product_repository.ids_for_mine(mine_id, ids.values()) if mine_id is not None else set()
+        errors += [
+            f"Product {idx}: Product {pid} does not belong to this mine"
+            for idx, pid in ids.items()
+            if pid not in owned
+        ]
+
+        keep = [(idx, item) for idx, item in rows if item.get("_action") != "delete"]
+        if not keep:
+            return errors
+        codes = Counter(item["code"] for _, item in keep if item.get("code"))
+        owners = self.product_repository.existing_codes(codes)
+        for idx, item in keep:
+            code = item.get("code")
+            # Rows without an id and without one of this mine's codes are inserted by the upsert
+            inserted = not item.get("id") and (mine_id is None or owners.get(code) != mine_id)
+            if inserted and self._is_empty(item.get("name")):
+                errors.append(f"Product {idx}: Field 'name' is required")
+            elif "name" in item and self._is_empty(item.get("name")):
+                errors.append(f"Product {idx}: Field 'name' may not be blank")
+            if code and codes[code] > 1:
+                errors.append(f"Product {idx}: Duplicate code in batch")
+            elif code in owners and owners[code] != mine_id:
+                errors.append(f"Product {idx}: Product code already exists")
+        return errors
+
+    def _sync_products(self, mine_id: int, payload: Dict[str, Any]) -> List[str]:
+        """
+        Apply the nested `products` rows (MineForm.to_payload) in one batched upsert.
+        Constraint violations the checks above cannot see (e.g. a name taken by a
+        soft-deleted product) roll back and come back as errors instead of a 500.
+        """
+        items = payload.get("products") or []
+        delete_missing = bool(payload.get("delete_missing_products"))
+        if not (items or delete_missing):
+            return []
+        try:
+            self.product_repository.upsert_many_for_mine(mine_id, items, delete_missing=delete_missing)
+        except IntegrityError as exc:
+            self.session.rollback()
+            return [f"Integrity error: {exc.orig}"]  # type: ignore[attr-defined]
+        return []
+
     @transactional
     def delete_mine(self, mine_id: int, *, soft: bool = True) -> Dict[str, Any]:
         self.repository.delete(mine_id, soft=soft)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from datetime import date
 from decimal import Decimal
 from typing import Optional, Dict, Any, List
 
 from app.lib import BaseModel
 import sqlalchemy as sa
 from sqlalchemy import (
+    DDL,
     CheckConstraint,
+    Computed,
     UniqueConstraint,
     Numeric,
     SmallInteger,
@@ -17,8 +20,10 @@ from sqlalchemy import (
     Text,
     func,
     select,
+    event,
+    text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property
+from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property, object_session
 
 from app.models.mine import Mine
 
@@ -44,6 +49,13 @@ class Product(BaseModel):
         comment="Name of the product"
     )
 
+    # lower(trim(name)), maintained by the database; case-insensitive lookups hit it directly
+    name_normalized: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        Computed("lower(trim(name))", persisted=True),
+        comment="Normalized name (generated)"
+    )
+
     code: Mapped[Optional[str]] = mapped_column(
         String(50),
         unique=True,
@@ -80,8 +92,24 @@ class Product(BaseModel):
         # Products can have same name but different mines (no unique constraint on name alone)
         # Only code needs to be globally unique (handled by unique=True on code column)
         UniqueConstraint('mine_id', 'name', name='uq_product_mine_name'),
-        Index('idx_product_mine', 'mine_id'),
+        # Also serves mine_id lookups; (mine_id, updated_at) backs the list ETag probe
+        Index('idx_product_mine_updated', 'mine_id', 'updated_at'),
         Index('idx_product_name', 'name'),
+        # Partial index over live rows: the default (include_deleted=False) reads skip soft-deleted products
+        Index(
+            'idx_product_not_deleted', 'name', 'code',
+            postgresql_where=text('deleted_at IS NULL'),
+            sqlite_where=text('deleted_at IS NULL'),
+        ),
+        # Trigram GIN indexes so ILIKE '%q%' searches avoid a sequential scan (PostgreSQL only)
+        Index(
+            'idx_product_name_trgm', 'name',
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'idx_product_code_trgm', 'code',
+            postgresql_using='gin', postgresql_ops={'code': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
     )
 
     # ---------------------------------------------------------------------
@@ -105,6 +133,35 @@ class Product(BaseModel):
         mine_identifier = mine_label.get_main_identifier() if mine_label else self.mine_id
         return f"<Product {product_identifier!r} (Mine: {mine_identifier})>"
 
+    @classmethod
+    def to_dict_many(cls, products) -> List[dict]:
+        """
+        Shallow to_dict() for a list of products (batch endpoints). Column keys
+        are resolved once for the batch instead of inspecting the mapper per row,
+        and mine refs not already loaded come from one id/name query for the whole
+        batch (typically a single mine) instead of a relationship load per product.
+        """
+        products = list(products)
+        keys = PRODUCT_PAYLOAD_KEYS
+        pending = {p.mine_id for p in products if "mine" not in p.__dict__ and p.mine_id is not None}
+        session = object_session(products[0]) if products else None
+        mine_names: Dict[int, Any] = {}
+        if pending and session is not None:
+            mine_names = dict(session.execute(select(Mine.id, Mine.name).where(Mine.id.in_(pending))).all())
+        rows = []
+        for p in products:
+            row = {k: getattr(p, k) for k in keys}
+            if "mine" in p.__dict__:
+                mine = p.__dict__["mine"]
+                row["mine__id"] = mine.id if mine is not None else None
+                row["mine__name"] = mine.name if mine is not None else None
+            else:
+                known = p.mine_id in mine_names
+                row["mine__id"] = p.mine_id if known else None
+                row["mine__name"] = mine_names.get(p.mine_id)
+            rows.append(row)
+        return product_rows_to_dicts(rows)
+
     def to_dict(self, deep: bool = False, include: set | None = None, exclude: set | None = None) -> dict:
         """
         Serialize product for API/UI usage.
@@ -119,13 +176,13 @@ class Product(BaseModel):
                 return None
             return {"id": getattr(obj, "id", None), label: getattr(obj, label, None)}
     
-        data = super().to_dict(include=include, exclude=exclude)
+        data = super().to_dict(include=include, exclude=exclude | {"name_normalized"})
     
         # Normalize core fields
         data.update({
             "code": getattr(self, "code", None),
             "name": getattr(self, "name", None),
-            "type": getattr(self, "type", None) if hasattr(self, "type") else None,
+            "type": getattr(self, "type", None) if _HAS_TYPE else None,
         })
     
         # Always provide mine as shallow ref (unless excluded)
@@ -147,6 +204,53 @@ class Product(BaseModel):
     
         return data
     
+# Resolved once: the mapped attributes never change at runtime
+_HAS_TYPE = hasattr(Product, "type")
+
+# Columns serialized in product payloads (the generated lookup column is internal)
+PRODUCT_PAYLOAD_KEYS = tuple(c.key for c in Product.__table__.c if c.key != "name_normalized")
+
+# Flat column list for row-based listings (ProductRepository.paginate(as_rows=True))
+PRODUCT_ROW_COLUMNS = tuple(Product.__table__.c) + (
+    Mine.id.label("mine__id"),
+    Mine.name.label("mine__name"),
+)
+
+
+def _json_value(value: Any) -> Any:
+    # date covers datetime; ISO strings instead of the JSON provider's RFC 1123 dates
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def product_rows_to_dicts(rows, *, sparse: bool = False) -> List[dict]:
+    """
+    Same shape as Product.to_dict() (shallow), built from PRODUCT_ROW_COLUMNS
+    mappings in one pass, without hydrating ORM instances.
+    sparse=True serializes projected rows (sparse fieldsets) as they are, without the mine ref.
+    """
+    if sparse:
+        return [{k: _json_value(v) for k, v in r.items()} for r in rows]
+    keys = PRODUCT_PAYLOAD_KEYS
+    out = []
+    for r in rows:
+        data = {k: _json_value(r[k]) for k in keys}
+        data["type"] = data.get("type") if _HAS_TYPE else None
+        mine_id = r["mine__id"]
+        data["mine"] = {"id": mine_id, "name": r["mine__name"]} if mine_id is not None else None
+        out.append(data)
+    return out
+
+# Case-insensitive name lookups per mine (ProductRepository.exists_name / existing_names)
+Index('idx_product_mine_name_norm', Product.mine_id, Product.name_normalized)
+
+
+# gin_trgm_ops requires the pg_trgm extension
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 Mine.products_count = column_property(
     select(func.count(Product.id))
     .where(Product.mine_id == Mine.id)
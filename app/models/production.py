@@ -10,6 +10,7 @@ from datetime import datetime, date
 
 from sqlalchemy import (
     CheckConstraint,
+    Computed,
     UniqueConstraint,
     Index,
     Boolean,
@@ -23,7 +24,9 @@ from sqlalchemy import (
     Text,
     text
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship, validates, object_session, Session
+from sqlalchemy import event, func, lambda_stmt, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Mapped, mapped_column, relationship, object_session, Session
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, date, timedelta
 import json
@@ -163,31 +166,6 @@ class Production(BaseModel):
     def __repr__(self) -> str:
         return f'<Production "{self.scenario_name}" - {self.contractual_year} ({self.status.value})>'
     
-    @validates("status")
-    def _validate_single_active_per_year(self, key, value):
-        """Checks when it is active"""
-        if value == ProductionStatus.ACTIVE:
-            sess = object_session(self)
-            if sess is None:
-                return value
-            
-            q = (
-                sess.query(type(self))
-                .filter(
-                    type(self).contractual_year == self.contractual_year,
-                    type(self).status == ProductionStatus.ACTIVE
-                )
-            )
-            if self.id is not None:
-                q = q.filter(type(self).id != self.id)
-                
-            if sess.query(q.exists()).scalar():
-                raise ValueError(
-                    f"There is already an ACTIVE scenario for the year {self.contractual_year}."
-                )
-        
-        return value
-    
     @property
     def duration_days(self) -> int:
         """Calculate duration of contractual year in days."""
@@ -204,13 +182,12 @@ class Production(BaseModel):
         if sess is None:
             # fallback: se não estiver anexado, usar o que houver em memória
             return len(getattr(self, 'enrolled_partners', []) or [])
-        # consulta leve com COUNT(*)
-        from app.models.production import ProductionPartnerEnrollment  # import local p/ evitar circular
-        return (
-            sess.query(ProductionPartnerEnrollment)
-            .filter(ProductionPartnerEnrollment.production_id == self.id)
-            .count()
-        )
+        # COUNT(*) direto, sem carregar as matrículas
+        return sess.scalar(
+            select(func.count())
+            .select_from(ProductionPartnerEnrollment)
+            .where(ProductionPartnerEnrollment.production_id == self.id)
+        ) or 0
         
     def get_enrolled_halco_buyers(self, session: 'Session') -> List['Partner']:
         """
@@ -248,11 +225,16 @@ class Production(BaseModel):
         Enforced by the partial unique index: at most one row can match.
         """
         y = year or date.today().year
-        return (
-            session.query(cls)
-            .filter(cls.contractual_year == y, cls.status == ProductionStatus.ACTIVE)
-            .one_or_none()
+
+        # lambda_stmt caches the compiled SQL; `y` becomes a bound parameter.
+        # The lambdas reference the module-level class so only `y` is tracked.
+        stmt = lambda_stmt(
+            lambda: select(Production).where(
+                Production.contractual_year == y,
+                Production.status == ProductionStatus.ACTIVE,
+            )
         )
+        return session.execute(stmt).scalar_one_or_none()
         
     @classmethod
     def get_finalized_previous_years(cls, session: 'Session', up_to_year: Optional[int] = None) -> List['Production']:
@@ -260,14 +242,67 @@ class Production(BaseModel):
         Returns COMPLETED productions for years strictly less than up_to_year (defaults to today.year).
         """
         cutoff = up_to_year or date.today().year
-        return (
-            session.query(cls)
-            .filter(cls.contractual_year < cutoff, cls.status == ProductionStatus.COMPLETED)
-            .order_by(cls.contractual_year.desc(), cls.scenario_name.asc(), cls.version.desc())
-            .all()
+        stmt = lambda_stmt(
+            lambda: select(Production)
+            .where(Production.contractual_year < cutoff, Production.status == ProductionStatus.COMPLETED)
+            .order_by(Production.contractual_year.desc(), Production.scenario_name.asc(), Production.version.desc())
         )
+        return list(session.execute(stmt).scalars().all())
     
-    def to_dict(self, deep: bool = False, include: set | None = None, exclude: set | None = None) -> dict:
+    @classmethod
+    def _aggregate_enrollment_summaries(cls, session: 'Session', production_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """
+        Computes enrollment summaries for many productions with a single
+        GROUP BY query, without loading any enrolled_partners collection.
+        """
+        PPE = ProductionPartnerEnrollment
+        planned = PPE.planned_tonnage
+        actual = func.coalesce(PPE.calculated_vld_total_tonnage, 0)
+        # Same fallback as the Python path: a zero/NULL stored variance is recomputed
+        variance = func.coalesce(func.nullif(PPE.vld_tonnage_variance, 0), actual - planned)
+
+        summaries = {
+            pid: {
+                "partners_count": 0,
+                "total_planned_tonnage": 0,
+                "total_actual_vld_tonnage": 0,
+                "total_vld_variance": 0,
+            }
+            for pid in production_ids
+        }
+        if not summaries:
+            return summaries
+
+        rows = session.execute(
+            select(
+                PPE.production_id,
+                func.count(PPE.id),
+                func.coalesce(func.sum(planned), 0),
+                func.coalesce(func.sum(actual), 0),
+                func.coalesce(func.sum(variance), 0),
+            )
+            .where(PPE.production_id.in_(list(summaries)))
+            .group_by(PPE.production_id)
+        )
+        for pid, count, total_planned, total_actual, total_variance in rows:
+            summaries[pid] = {
+                "partners_count": count,
+                "total_planned_tonnage": total_planned,
+                "total_actual_vld_tonnage": total_actual,
+                "total_vld_variance": total_variance,
+            }
+        return summaries
+
+    def _aggregate_enrollment_summary(self, session: 'Session') -> Dict[str, int]:
+        """Single-production variant of _aggregate_enrollment_summaries."""
+        return self._aggregate_enrollment_summaries(session, [self.id])[self.id]
+
+    def to_dict(
+        self,
+        deep: bool = False,
+        include: set | None = None,
+        exclude: set | None = None,
+    ) -> dict:
         include = set(include or [])
         exclude = set(exclude or [])
     
@@ -284,13 +319,19 @@ class Production(BaseModel):
             "period_end": getattr(self, "period_end", None),
             "mine": ref(getattr(self, "mine", None)),
         })
+
+        need_enrollments = deep or ("enrolled_partners" in include)
+        sess = object_session(self)
+        if not need_enrollments and "enrolled_partners" not in self.__dict__ and sess is not None and self.id is not None:
+            # Summary only: aggregate in SQL instead of materializing the collection
+            data["enrollment_summary"] = self._aggregate_enrollment_summary(sess)
+            return data
     
         enrollments = list(getattr(self, "enrolled_partners", []) or [])
     
         # Helper to compute planned_tonnage consistently with PPE.to_dict
         def planned_tonnage_for(e) -> int:
-            incentive = e.manual_incentive_tonnage if e.manual_incentive_tonnage is not None else (e.calculated_incentive_tonnage or 0)
-            return e.adjusted_tonnage if e.adjusted_tonnage is not None else (e.minimum_tonnage + incentive)
+            return e.resolved_planned_tonnage()
     
         total_planned = sum(planned_tonnage_for(e) for e in enrollments)
         total_actual = sum((e.calculated_vld_total_tonnage or 0) for e in enrollments)
@@ -303,7 +344,6 @@ class Production(BaseModel):
             "total_vld_variance": total_variance,
         }
     
-        need_enrollments = deep or ("enrolled_partners" in include)
         if need_enrollments:
             # Expand each enrollment (and include vld_count from the model)
             expanded = []
@@ -317,7 +357,7 @@ class Production(BaseModel):
                 ed["vld_count"] = ed.get("vld_count", e.calculated_vld_count or 0)
                 expanded.append(ed)
             data["enrolled_partners"] = expanded
-    
+
         return data
         
 class ProductionPartnerEnrollment(BaseModel):
@@ -377,6 +417,15 @@ class ProductionPartnerEnrollment(BaseModel):
         comment="When the incentive tonnage is inserted automatically"
     )
     
+    planned_tonnage: Mapped[int] = mapped_column(
+        Integer,
+        Computed(
+            "COALESCE(adjusted_tonnage, minimum_tonnage + COALESCE(manual_incentive_tonnage, calculated_incentive_tonnage, 0))",
+            persisted=True,
+        ),
+        comment="Adjusted tonnage, else minimum + incentive (generated)"
+    )
+    
     # ---------------------------------------------------------------------
     # VLD Calculations
     # ---------------------------------------------------------------------
@@ -436,6 +485,19 @@ class ProductionPartnerEnrollment(BaseModel):
             else (self.calculated_incentive_tonnage or 0)
         )
         
+    def resolved_planned_tonnage(self) -> int:
+        """
+        Generated planned_tonnage when it reflects the row; recomputed with the
+        same rule while the instance is transient or has unflushed changes.
+        """
+        if self.planned_tonnage is not None and not sa_inspect(self).modified:
+            return self.planned_tonnage
+        return (
+            self.adjusted_tonnage
+            if self.adjusted_tonnage is not None
+            else (self.minimum_tonnage + self.incentive_tonnage)
+        )
+        
     def __repr__(self) -> str:
         return f'<PPE id={self.id} prod={self.production_id} partner={self.partner_id} lot={self.vessel_size_t}>'
 
@@ -462,12 +524,8 @@ class ProductionPartnerEnrollment(BaseModel):
             else (self.calculated_incentive_tonnage or 0)
         )
     
-        # Planned tonnage rule
-        planned_tonnage = (
-            self.adjusted_tonnage
-            if self.adjusted_tonnage is not None
-            else (self.minimum_tonnage + incentive)
-        )
+        # Planned tonnage rule (generated column, recomputed if unflushed)
+        planned_tonnage = self.resolved_planned_tonnage()
     
         # Actuals from VLD aggregates already on the model
         actual_vld_count = self.calculated_vld_count or 0
@@ -494,3 +552,46 @@ class ProductionPartnerEnrollment(BaseModel):
         })
     
         return data
+
+
+# ---------------------------------------------------------------------
+# Single ACTIVE scenario per contractual year
+# ---------------------------------------------------------------------
+@event.listens_for(Session, "before_flush")
+def _check_single_active_per_year(session, flush_context, instances):
+    """
+    Batched replacement for a per-assignment validator: one query per flush
+    covering every new/dirty Production that is being saved as ACTIVE.
+    """
+    pending = [o for o in (session.new | session.dirty) if isinstance(o, Production)]
+    active = [o for o in pending if o.status == ProductionStatus.ACTIVE]
+    if not active:
+        return
+
+    years: Dict[int, Production] = {}
+    for prod in active:
+        if prod.contractual_year in years:
+            raise ValueError(
+                f"There is already an ACTIVE scenario for the year {prod.contractual_year}."
+            )
+        years[prod.contractual_year] = prod
+
+    # Rows changed in this flush are judged by their in-memory state above;
+    # rows being deleted in it no longer hold the year
+    pending_ids = [o.id for o in pending if o.id is not None]
+    pending_ids += [o.id for o in session.deleted if isinstance(o, Production) and o.id is not None]
+    stmt = (
+        select(Production.contractual_year)
+        .where(
+            Production.status == ProductionStatus.ACTIVE,
+            Production.contractual_year.in_(list(years)),
+        )
+        .group_by(Production.contractual_year)
+    )
+    if pending_ids:
+        stmt = stmt.where(Production.id.not_in(pending_ids))
+
+    with session.no_autoflush:
+        clash = session.execute(stmt.limit(1)).scalar()
+    if clash is not None:
+        raise ValueError(f"There is already an ACTIVE scenario for the year {clash}.")
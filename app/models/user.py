@@ -1,6 +1,11 @@
 from __future__ import annotations
+import hashlib
+import hmac
+import secrets
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -10,6 +15,34 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from app.lib import BaseModel
 
+# Successful (password_hash, HMAC(raw)) verifications, most recent last.
+# Only successes are remembered, so failed attempts always pay the full KDF cost.
+# Keys use an HMAC under a random per-process secret, not a bare unsalted digest
+# of the password, so cached entries cannot be matched against precomputed hashes.
+_VERIFIED: "OrderedDict[Tuple[str, bytes], None]" = OrderedDict()
+_VERIFIED_MAXSIZE = 4096
+_VERIFIED_SECRET = secrets.token_bytes(32)
+# gthread workers verify concurrently; OrderedDict reordering/eviction is not atomic
+_VERIFIED_LOCK = threading.Lock()
+
+
+def _verify(password_hash: str, raw_password: str) -> bool:
+    """check_password_hash with an LRU of recent successful verifications."""
+    digest = hmac.new(_VERIFIED_SECRET, raw_password.encode("utf-8"), hashlib.sha256).digest()
+    key = (password_hash, digest)
+    with _VERIFIED_LOCK:
+        if key in _VERIFIED:
+            _VERIFIED.move_to_end(key)
+            return True
+    if not check_password_hash(password_hash, raw_password):
+        return False
+    with _VERIFIED_LOCK:
+        _VERIFIED[key] = None
+        if len(_VERIFIED) > _VERIFIED_MAXSIZE:
+            _VERIFIED.popitem(last=False)
+    return True
+
+
 class User(UserMixin, BaseModel):
     """
     User model with hashed password, flags and timestamps
@@ -34,7 +67,7 @@ class User(UserMixin, BaseModel):
         self.password_hash = generate_password_hash(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
-        return check_password_hash(self.password_hash, raw_password)
+        return _verify(self.password_hash, raw_password)
     
     def __repr__(self) -> str:
         return f"<User id={self.id} email={self.email} username={self.username}>"
@@ -1,25 +1,20 @@
 """
-Lib - Biblioteca interna da aplicação.
+Product Module
+==============
 
-Este módulo contém componentes reutilizáveis que podem ser usados
-por qualquer parte da aplicação ou até mesmo extraídos como
-biblioteca externa no futuro.
+This module contains all product-related functionality including:
+- Models (Product - defined in app.models.product)
+- Repository layer (ProductRepository)
+- Service layer (ProductService)
+- Routes (Product API endpoints)
 """
 
-__version__ = "1.0.0"
-__author__ = "HQ Development Team"
-
-# Imports principais
-from .repository import BaseRepository, RepositoryMixin
-from .services import BaseService
-from .utils import ValidationUtils, StringUtils
-from .base_model import BaseModel
+from app.product.routes.product_routes import product_bp
+from app.product.services import ProductService
+from app.product.repository.product_repository import ProductRepository
 
 __all__ = [
-    'BaseRepository',
-    'RepositoryMixin',
-    'BaseService', 
-    'ValidationUtils',
-    'StringUtils',
-    'BaseModel'
+    'product_bp',
+    'ProductService',
+    'ProductRepository'
 ]
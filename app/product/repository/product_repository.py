@@ -1,41 +1,170 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import base64
+import json
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from sqlalchemy import asc, desc, or_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    asc,
+    cast,
+    delete as sa_delete,
+    desc,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from flask import current_app, has_app_context
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from app.extensions import db
-from app.models.product import Product
+from app.lib.repository.pagination import Page
+from app.lib.utils.request_cache import request_cache
+from app.models.mine import Mine
+from app.models.product import PRODUCT_ROW_COLUMNS, Product
 
 
-@dataclass
-class Page:
-    items: list
-    total: int
-    page: int
-    per_page: int
-    pages: int
+# Whitelisted sort columns, built once (unknown fields fall back to id)
+_SORT_FIELDS = {
+    "id": Product.id,
+    "name": Product.name,
+    "code": Product.code,
+    "mine_id": Product.mine_id,
+    "created_at": Product.created_at,
+    "updated_at": Product.updated_at,
+}
+
+
+# The mine fields product serialization reads (to_dict shallow ref / deep expansion).
+# load_only keeps Mine's correlated products_count subquery out of every product load.
+_MINE_REF = selectinload(Product.mine).load_only(Mine.id, Mine.name, Mine.code, Mine.country, Mine.updated_at)
+
+
+def _chunks(seq: Iterable[Any], n: int = 500) -> Iterator[List[Any]]:
+    """Split `seq` into lists of at most `n` items (keeps IN lists under driver parameter limits)."""
+    chunk: List[Any] = []
+    for item in seq:
+        chunk.append(item)
+        if len(chunk) >= n:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encode_cursor(value: Any, last_id: int) -> str:
+    """Opaque cursor for the row (sort value, id)."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps({"v": value, "id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str, col: Any) -> tuple[Any, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, last_id = data["v"], int(data["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if value is not None and getattr(col.type, "python_type", None) is datetime:
+        value = datetime.fromisoformat(value)
+    return value, last_id
+
+
+# Audit columns from BaseModel; set by the model/repository, never taken from payloads
+_AUDIT_COLUMNS = frozenset({"created_at", "updated_at", "created_by", "updated_by", "deleted_at", "deleted_by"})
 
 
 class ProductRepository:
+    # Client-writable columns, derived from the table: everything but the key, generated and audit columns
+    WRITABLE_FIELDS = tuple(
+        c.key for c in Product.__table__.c
+        if not c.primary_key and c.computed is None and c.key not in _AUDIT_COLUMNS
+    )
+    # Fields carried by the mine form's product rows (ProductInlineForm.to_payload)
+    UPSERT_FIELDS = ("name", "code", "description")
+
     def __init__(self, session: Optional[Session] = None) -> None:
-        self.session = session or db.session
+        self._session = session
+
+    @property
+    def session(self) -> Session:
+        # Resolved per call: db.session is Flask-SQLAlchemy's request-scoped session,
+        # so a long-lived repository still works on the current request's session.
+        return self._session if self._session is not None else db.session
 
     # ------------------- read -------------------
-    def _base(self, include_deleted: bool = False, q: str | None = None) -> Any:
-        stmt = select(Product)
+    @staticmethod
+    def _raiseload_enabled() -> bool:
+        if not has_app_context():
+            return True
+        return bool(current_app.config.get("PRODUCT_REPO_RAISELOAD", True))
+
+    def _base(
+        self,
+        include_deleted: bool = False,
+        q: str | None = None,
+        mine_id: int | None = None,
+        as_rows: bool = False,
+        columns: Optional[List[Any]] = None,
+    ) -> Any:
+        if columns:
+            # Projection of plain product columns only (sparse fieldsets)
+            stmt = select(*columns)
+        elif as_rows:
+            # Plain columns (+ the mine's id/name via a many-to-one outer join, one row per product)
+            stmt = select(*PRODUCT_ROW_COLUMNS).outerjoin(Mine, Product.mine_id == Mine.id)
+        else:
+            # selectinload: one IN query for the page's mines (no JOIN row multiplication under LIMIT);
+            # raiseload: any other lazy load on a listed product fails fast instead of going N+1
+            stmt = select(Product).options(_MINE_REF)
+            if self._raiseload_enabled():
+                stmt = stmt.options(raiseload("*"))
         if not include_deleted:
             stmt = stmt.where(Product.deleted_at.is_(None))
+        if mine_id is not None:
+            stmt = stmt.where(Product.mine_id == mine_id)
         if q:
-            pattern = f"%{q.strip()}%"
-            stmt = stmt.where(
-                or_(Product.name.ilike(pattern), Product.code.ilike(pattern))
-            )
+            stmt = stmt.where(self._search_clause(q.strip()))
         return stmt
 
+    @staticmethod
+    def _search_clause(q: str) -> Any:
+        """
+        Substring match on name/code, the same on every dialect. On PostgreSQL
+        the pg_trgm GIN indexes (idx_product_name_trgm / idx_product_code_trgm) serve it.
+        """
+        pattern = f"%{q}%"
+        return or_(Product.name.ilike(pattern), Product.code.ilike(pattern))
+
+    @staticmethod
+    def _keyset_column(sort_by: str) -> Any:
+        """
+        Sort column for keyset pagination. Nullable columns (code) are refused:
+        a (col, id) tuple comparison is NULL for NULL values, so pages would skip rows.
+        """
+        col = _SORT_FIELDS.get(sort_by, Product.id)
+        if col.nullable:
+            raise ValueError(f"Cursor pagination cannot sort by '{sort_by}'")
+        return col
+
+    @staticmethod
+    def _after(stmt: Any, col: Any, value: Any, last_id: int, descending: bool = False) -> Any:
+        """Keyset predicate: rows strictly after (value, last_id) in (col, id) order."""
+        if col is Product.id:
+            return stmt.where(Product.id < last_id if descending else Product.id > last_id)
+        left, right = tuple_(col, Product.id), tuple_(value, last_id)
+        return stmt.where(left < right if descending else left > right)
+
     def paginate(
         self,
         *,
@@ -43,37 +172,264 @@ class ProductRepository:
         per_page: int = 20,
         include_deleted: bool = False,
         q: str | None = None,
+        mine_id: int | None = None,
         sort_by: str = "id",
         sort_direction: str = "asc",
+        cursor: str | None = None,
+        need_total: bool = True,
+        as_rows: bool = False,
+        fields: Optional[Iterable[str]] = None,
     ) -> Page:
-        stmt = self._base(include_deleted=include_deleted, q=q)
-        col = getattr(Product, sort_by, Product.id)
-        direction = asc if (sort_direction or "asc").lower() == "asc" else desc
+        """
+        Offset pagination by default. When `cursor` is given (use "" for the
+        first page), switches to keyset pagination: no COUNT, no OFFSET, and the
+        returned Page carries `next_cursor` / `has_more`.
+        In offset mode the total comes from COUNT(*) OVER () on the page query
+        itself; pass need_total=False to skip it.
+        as_rows=True returns column mappings (PRODUCT_ROW_COLUMNS) instead of
+        Product instances, for callers that only serialize the page.
+        fields=("id", "name", ...) narrows those rows to the given product columns
+        (id and the sort column are always included, the cursor needs them).
+        """
+        col = self._keyset_column(sort_by) if cursor is not None else _SORT_FIELDS.get(sort_by, Product.id)
+        columns = None
+        if fields:
+            as_rows = True
+            columns = [Product.__table__.c[f] for f in dict.fromkeys(("id", col.key, *fields))]
+        stmt = self._base(include_deleted=include_deleted, q=q, mine_id=mine_id, as_rows=as_rows, columns=columns)
+
+        def fetch(st: Any) -> list:
+            result = self.session.execute(st)
+            return (result.mappings() if as_rows else result.scalars()).all()
+        descending = (sort_direction or "asc").lower() != "asc"
+        direction = desc if descending else asc
+
+        if cursor is not None:
+            per_page = max(1, int(per_page or 20))
+            if cursor:
+                value, last_id = _decode_cursor(cursor, col)
+                stmt = self._after(stmt, col, value, last_id, descending)
+            stmt = stmt.order_by(direction(col), direction(Product.id)).limit(per_page + 1)
+            rows = fetch(stmt)
+            has_more = len(rows) > per_page
+            items = rows[:per_page]
+            next_cursor = None
+            if has_more:
+                last = items[-1]
+                next_cursor = (
+                    _encode_cursor(last[col.key], last["id"]) if as_rows
+                    else _encode_cursor(getattr(last, col.key), last.id)
+                )
+            return Page(
+                items=items, total=None, page=1, per_page=per_page, pages=None,
+                next_cursor=next_cursor, has_more=has_more,
+            )
+
         stmt = stmt.order_by(direction(col))
 
-        total = self.session.execute(stmt.with_only_columns(Product.id)).scalars().unique().count()
         page = max(1, int(page or 1))
         per_page = max(1, int(per_page or 20))
         offset = (page - 1) * per_page
-        items = self.session.execute(stmt.offset(offset).limit(per_page)).scalars().all()
+        if not need_total:
+            items = fetch(stmt.offset(offset).limit(per_page))
+            return Page(items=items, total=None, page=page, per_page=per_page, pages=None)
+
+        # One round trip: the window count is evaluated before LIMIT/OFFSET
+        rows = self.session.execute(
+            stmt.add_columns(func.count().over().label("total")).offset(offset).limit(per_page)
+        ).all()
+        if as_rows:
+            items = [{k: v for k, v in r._mapping.items() if k != "total"} for r in rows]
+        else:
+            items = [r[0] for r in rows]
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page: no row to carry the window count
+            total = self.session.execute(
+                select(func.count()).select_from(stmt.order_by(None).subquery())
+            ).scalar_one()
+        else:
+            total = 0
         pages = (total + per_page - 1) // per_page if per_page else 1
         return Page(items=items, total=total, page=page, per_page=per_page, pages=pages)
 
-    def get(self, product_id: int) -> Optional[Product]:
-        stmt = select(Product).where(Product.id == product_id)
-        return self.session.execute(stmt).scalars().first()
+    def list_fingerprint(
+        self,
+        *,
+        include_deleted: bool = False,
+        q: str | None = None,
+        mine_id: int | None = None,
+    ) -> tuple[Optional[datetime], Optional[datetime], int]:
+        """
+        (max(product updated_at), max(mine updated_at), count) of the rows a
+        listing would page over, in one query. The mine's timestamp is part of
+        it because listed products embed the mine's name.
+        """
+        sub = self._base(include_deleted=include_deleted, q=q, mine_id=mine_id).subquery()
+        stmt = (
+            select(func.max(sub.c.updated_at), func.max(Mine.updated_at), func.count())
+            .select_from(sub)
+            .outerjoin(Mine, sub.c.mine_id == Mine.id)
+        )
+        row = self.session.execute(stmt).one()
+        return row[0], row[1], row[2]
+
+    def paginate_after(
+        self,
+        *,
+        last_id: int | None = None,
+        last_value: Any = None,
+        per_page: int = 20,
+        include_deleted: bool = False,
+        q: str | None = None,
+        mine_id: int | None = None,
+        sort_by: str = "id",
+    ) -> list:
+        """
+        Keyset pagination: returns the next `per_page` products after the
+        row identified by (last_value, last_id) in ascending (sort_by, id) order.
+        Cost is O(per_page) regardless of depth, unlike OFFSET.
+        """
+        stmt = self._base(include_deleted=include_deleted, q=q, mine_id=mine_id)
+        col = self._keyset_column(sort_by)
+        if last_id is not None:
+            stmt = self._after(stmt, col, last_value, last_id)
+        per_page = max(1, int(per_page or 20))
+        stmt = stmt.order_by(asc(col), asc(Product.id)).limit(per_page)
+        return self.session.execute(stmt).scalars().all()
+
+    def get(self, product_id: int, *, for_update: bool = False) -> Optional[Product]:
+        if for_update:
+            # An identity-map hit would not lock the row: always SELECT ... FOR UPDATE
+            stmt = lambda_stmt(lambda: select(Product).where(Product.id == product_id).with_for_update())
+            return self.session.execute(stmt).scalars().first()
+        # Session.get checks the identity map first and only queries on a miss
+        return self.session.get(Product, product_id, options=[_MINE_REF])
+
+    def iter_by_ids(self, ids: Iterable[int], include_deleted: bool = False) -> Iterator[Product]:
+        """
+        Products for `ids`, ~500 ids per IN list. The IN chunks already bound each
+        batch; yield_per is not used because the selectin mine load cannot run
+        under it for ORM entities.
+        """
+        for chunk in _chunks(dict.fromkeys(ids)):
+            stmt = select(Product).options(_MINE_REF).where(Product.id.in_(chunk))
+            if not include_deleted:
+                stmt = stmt.where(Product.deleted_at.is_(None))
+            yield from self.session.execute(stmt).scalars().all()
+
+    def iter_rows_by_mine(self, mine_id: int, include_deleted: bool = False) -> Iterator[List[Any]]:
+        """
+        All of a mine's products as PRODUCT_ROW_COLUMNS mappings, in id order,
+        one partition of up to 200 rows at a time from a server-side cursor.
+        """
+        stmt = self._base(include_deleted=include_deleted, mine_id=mine_id, as_rows=True).order_by(Product.id)
+        result = self.session.execute(stmt.execution_options(stream_results=True, yield_per=200))
+        try:
+            yield from result.mappings().partitions()
+        finally:
+            result.close()
+
+    def get_by_ids(self, ids: Iterable[int], include_deleted: bool = False) -> List[Product]:
+        return list(self.iter_by_ids(ids, include_deleted=include_deleted))
+
+    def ids_for_mine(self, mine_id: int, ids: Iterable[int]) -> set[int]:
+        """Which of `ids` are products of `mine_id` (soft-deleted included, as upsert_many_for_mine matches them)."""
+        found: set[int] = set()
+        for chunk in _chunks(set(ids)):
+            found.update(self.session.scalars(select(Product.id).where(Product.mine_id == mine_id, Product.id.in_(chunk))))
+        return found
+
+    def get_by_id_and_mine(self, product_id: int, mine_id: int) -> Optional[Product]:
+        """Live product `product_id` if it belongs to `mine_id` (identity-map fast path)."""
+        entity = self.session.get(Product, product_id)
+        if entity is None or entity.mine_id != mine_id or entity.deleted_at is not None:
+            return None
+        return entity
+
+    def exists_name(self, name: str, mine_id: int | None, exclude_id: int | None = None) -> bool:
+        """
+        Case-insensitive name check within a mine. LIMIT 1 lets the planner stop
+        at the first hit (served by idx_product_mine_name_norm).
+        Memoized per request until the next write.
+        """
+        norm = (name or "").strip().lower()
+        cache = request_cache("product_repository")
+        key = ("exists_name", norm, mine_id, exclude_id)
+        if cache is not None and key in cache:
+            return cache[key]
+
+        # lambda_stmt: SQL compiled once per shape; name/mine_id/exclude_id are bound parameters.
+        # SELECT 1 ... LIMIT 1 stops at the first hit like EXISTS, but takes appended criteria.
+        raw = (name or "").strip()
+        stmt = lambda_stmt(lambda: select(literal(1)).where(
+            Product.name_normalized == func.lower(func.trim(raw)),
+            Product.deleted_at.is_(None),
+        ))
+        if mine_id is None:  # IS NULL needs its own shape; a cached "= :param" never matches NULL
+            stmt += lambda s: s.where(Product.mine_id.is_(None))
+        else:
+            stmt += lambda s: s.where(Product.mine_id == mine_id)
+        if exclude_id is not None:
+            stmt += lambda s: s.where(Product.id != exclude_id)
+        stmt += lambda s: s.limit(1)
+        result = self.session.execute(stmt).scalar() is not None
+        if cache is not None:
+            cache[key] = result
+        return result
+
+    def existing_names(self, pairs: Iterable[tuple[int | None, str]]) -> Dict[tuple[int | None, str], set[int]]:
+        """
+        Batch form of exists_name: which of the (mine_id, name) pairs already
+        belong to a live product, mapped to the ids holding them. Keys are the
+        pairs as given (names stripped); the comparison normalizes them in SQL
+        with the same lower(trim()) as name_normalized, so it agrees with the
+        stored column on every dialect.
+        """
+        wanted = {(mine_id, (name or "").strip()) for mine_id, name in pairs}
+        found: Dict[tuple[int | None, str], set[int]] = {}
+        # 200 rows per UNION ALL keeps each statement under SQLite's compound-select limit
+        for chunk in _chunks(wanted, 200):
+            rows = [
+                select(cast(literal(mine_id), Integer).label("mine_id"), cast(literal(name), String).label("name"))
+                for mine_id, name in chunk
+            ]
+            w = (rows[0] if len(rows) == 1 else union_all(*rows)).subquery("wanted")
+            stmt = select(w.c.mine_id, w.c.name, Product.id).join(
+                Product,
+                and_(
+                    Product.mine_id == w.c.mine_id,
+                    Product.name_normalized == func.lower(func.trim(w.c.name)),
+                    Product.deleted_at.is_(None),
+                ),
+            )
+            for mine_id, name, product_id in self.session.execute(stmt):
+                found.setdefault((mine_id, name), set()).add(product_id)
+        return found
+
+    def existing_codes(self, codes: Iterable[str]) -> Dict[str, int]:
+        """
+        Which of `codes` are already taken (codes are unique across all rows,
+        deleted included), mapped to the mine_id of the product holding each.
+        """
+        found: Dict[str, int] = {}
+        for chunk in _chunks({c for c in codes if c}):
+            stmt = select(Product.code, Product.mine_id).where(Product.code.in_(chunk))
+            for code, mine_id in self.session.execute(stmt).tuples():
+                found[code] = mine_id
+        return found
 
     # ------------------- write -------------------
+    def _insert_row(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for a new product: WRITABLE_FIELDS only, name stripped, empty code as NULL."""
+        row = {f: payload[f] for f in self.WRITABLE_FIELDS if f in payload}
+        row["name"] = (payload.get("name") or "").strip()
+        row["code"] = payload.get("code") or None
+        return row
+
     def create(self, payload: Dict[str, Any]) -> Product:
-        entity = Product(
-            name=(payload.get("name") or "").strip(),
-            code=(payload.get("code") or None),
-            category=payload.get("category"),
-            subtype=payload.get("subtype"),
-            mine_id=payload.get("mine_id"),
-            unit=payload.get("unit"),
-            is_active=payload.get("is_active", True),
-        )
+        entity = Product(**self._insert_row(payload))
         self.session.add(entity)
         self.session.flush()
         return entity
@@ -82,26 +438,130 @@ class ProductRepository:
         entity = self.get(product_id)
         if not entity:
             raise ValueError("Product not found")
-        for field in ["name", "code", "category", "subtype", "mine_id", "unit", "is_active"]:
+        for field in self.WRITABLE_FIELDS:
             if field in payload:
                 setattr(entity, field, payload[field])
         self.session.flush()
         return entity
 
+    def bulk_create(self, payloads: List[Dict[str, Any]]) -> List[Product]:
+        """Insert many products with a single executemany INSERT ... RETURNING."""
+        if not payloads:
+            return []
+        rows = [self._insert_row(payload) for payload in payloads]
+        return list(self.session.scalars(insert(Product).returning(Product), rows).all())
+
+    def bulk_update_fields(self, updates: List[Dict[str, Any]]) -> None:
+        """
+        Update many products by primary key in one executemany UPDATE.
+        Each item must carry "id" plus the fields to change.
+        """
+        rows = [
+            {"id": u["id"], **{f: u[f] for f in self.WRITABLE_FIELDS if f in u}}
+            for u in updates
+            if u.get("id") is not None
+        ]
+        if rows:
+            self.session.execute(update(Product), rows)
+
+    def upsert_many_for_mine(
+        self,
+        mine_id: int,
+        items: List[Dict[str, Any]],
+        *,
+        delete_missing: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Synchronize a mine's products with `items` (ProductInlineForm payloads).
+        - rows matched by id (or by code) are updated, unless nothing changed
+        - unmatched rows are inserted
+        - rows with `_action == "delete"` are soft-deleted
+        - delete_missing=True also soft-deletes every other live product of the mine
+        Writes are batched: one executemany UPDATE, one executemany INSERT and
+        one soft-delete UPDATE, instead of a flush per row.
+        """
+        # Only preload the rows `items` can match, unless every row is needed for delete_missing
+        conds = [Product.mine_id == mine_id]
+        if not delete_missing:
+            wanted_ids = {i["id"] for i in items if i.get("id")}
+            wanted_codes = {i["code"] for i in items if i.get("code")}
+            conds.append(or_(Product.id.in_(wanted_ids), Product.code.in_(wanted_codes)))
+            needs_lookup = bool(wanted_ids or wanted_codes)
+        else:
+            needs_lookup = True
+        existing = (
+            {p.id: p for p in self.session.execute(select(Product).where(*conds)).scalars()}
+            if needs_lookup
+            else {}
+        )
+        code_index = {p.code: p for p in existing.values() if p.code}
+
+        to_insert: List[Dict[str, Any]] = []
+        to_update: List[Dict[str, Any]] = []
+        delete_ids: set[int] = set()
+        matched_ids: set[int] = set()
+        for raw in items:
+            product = existing.get(raw.get("id")) or code_index.get(raw.get("code"))
+            if raw.get("_action") == "delete":
+                if product is not None:
+                    delete_ids.add(product.id)
+                continue
+            fields = {f: raw[f] for f in self.UPSERT_FIELDS if f in raw}
+            if "name" in fields:
+                fields["name"] = (fields["name"] or "").strip()
+            if product is None:
+                to_insert.append({**fields, "mine_id": mine_id})
+            else:
+                matched_ids.add(product.id)
+                # unchanged rows stay out of the UPDATE batch (and keep their loaded state)
+                if any(getattr(product, f) != v for f, v in fields.items()):
+                    to_update.append({"id": product.id, **fields})
+
+        if delete_missing:
+            delete_ids |= {
+                pid for pid, p in existing.items() if pid not in matched_ids and p.deleted_at is None
+            }
+
+        if to_update:
+            self.session.execute(update(Product), to_update)
+            # bulk UPDATE by primary key does not touch loaded instances
+            for row in to_update:
+                self.session.expire(existing[row["id"]])
+        created: List[Product] = []
+        if to_insert:
+            created = list(self.session.scalars(insert(Product).returning(Product), to_insert).all())
+        if delete_ids:
+            self.session.execute(
+                update(Product)
+                .where(Product.id.in_(delete_ids), Product.deleted_at.is_(None))
+                .values(deleted_at=datetime.utcnow())
+            )
+
+        return {
+            "created": created,
+            "updated": [existing[row["id"]] for row in to_update],
+            "deleted_ids": sorted(delete_ids),
+        }
+
     def delete(self, product_id: int, soft: bool = True) -> None:
-        entity = self.get(product_id)
-        if not entity:
-            return
+        # Single UPDATE/DELETE statement; no SELECT of the row beforehand
         if soft:
-            entity.deleted_at = datetime.utcnow()
-            self.session.flush()
+            self.session.execute(
+                update(Product)
+                .where(Product.id == product_id, Product.deleted_at.is_(None))
+                .values(deleted_at=datetime.utcnow())
+            )
         else:
-            self.session.delete(entity)
-            self.session.flush()
+            self.delete_by_id(product_id)
+
+    def delete_by_id(self, product_id: int) -> bool:
+        """Hard delete in one statement, for callers that don't need the entity back."""
+        result = self.session.execute(sa_delete(Product).where(Product.id == product_id))
+        return bool(result.rowcount)
 
     def restore(self, product_id: int) -> None:
-        entity = self.get(product_id)
-        if not entity:
-            return
-        entity.deleted_at = None
-        self.session.flush()
+        self.session.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.deleted_at.is_not(None))
+            .values(deleted_at=None)
+        )
@@ -1,24 +1,31 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from http import HTTPStatus
 from typing import Any, Dict, Tuple
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 
 from app.product.services.product_service import ProductService
 
 product_bp = Blueprint("product_bp", __name__, url_prefix="/api/products")
-service = ProductService()
+
+# Upper bound for ?per_page= (larger exports go through /stream)
+MAX_PER_PAGE = 200
 
 
 # --------------------------- helpers --------------------------- #
-def _response(envelope: Dict[str, Any], *, success_code=HTTPStatus.OK) -> Tuple[Any, int]:
+def _response(
+    envelope: Dict[str, Any], *, success_code=HTTPStatus.OK, etag: str | None = None
+) -> Tuple[Any, ...]:
     """
     Map BaseService envelopes to proper HTTP status codes.
     - success=True  -> 2xx (default 200 or provided)
     - success=False -> choose 4xx/5xx based on error_code / message
     """
     if envelope.get("success"):
+        if etag:
+            return jsonify(envelope), int(success_code), _validator_headers(etag)
         return jsonify(envelope), int(success_code)
 
     code = str(envelope.get("error_code") or "").upper()
@@ -39,12 +46,33 @@ def _response(envelope: Dict[str, Any], *, success_code=HTTPStatus.OK) -> Tuple[
 
 
 def _json_body() -> Dict[str, Any]:
-    if not request.is_json:
-        return {}
-    data = request.get_json(silent=True) or {}
-    if not isinstance(data, dict):
-        return {}
-    return data
+    # get_json() returns None for non-JSON content types when silent=True;
+    # cache=True keeps the parsed body on the request for later helpers.
+    data = request.get_json(silent=True, cache=True)
+    return data if isinstance(data, dict) else {}
+
+
+def _validator_headers(etag: str) -> Dict[str, str]:
+    # no-cache: clients may store the body but revalidate (cheap 304) before reuse
+    return {"ETag": f'W/"{etag}"', "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(etag: str) -> bool:
+    return request.if_none_match.contains_weak(etag)
+
+
+@lru_cache(maxsize=1)
+def _svc() -> ProductService:
+    """Process-wide ProductService, built on first use (its session resolves per request)."""
+    return ProductService()
+
+
+def _truthy(value: str) -> bool:
+    return value.lower() in {"1", "true", "yes"}
+
+
+def _csv(value: str) -> tuple[str, ...] | None:
+    return tuple(f.strip() for f in value.split(",") if f.strip()) or None
 
 
 # --------------------------- routes --------------------------- #
@@ -56,34 +84,53 @@ def list_products():
       - page, per_page
       - mine_id, name, code
       - q (free text), sort_by, sort_dir, include_deleted
+      - cursor (keyset pagination; empty for the first page, then next_cursor)
+      - fields (comma-separated product columns; returns only those, without the mine ref)
     """
-    page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 20))
-
-    filters: Dict[str, Any] = {}
-    if "mine_id" in request.args:
-        try:
-            filters["mine_id"] = int(request.args["mine_id"])
-        except ValueError:
-            pass
-    if "name" in request.args:
-        filters["name"] = request.args["name"]
-    if "code" in request.args:
-        filters["code"] = request.args["code"]
-    if "q" in request.args:
-        filters["q"] = request.args["q"]
-    if "sort_by" in request.args:
-        filters["sort_by"] = request.args["sort_by"]
-    if "sort_dir" in request.args:
-        filters["sort_dir"] = request.args["sort_dir"]
-    if "include_deleted" in request.args:
-        filters["include_deleted"] = request.args.get("include_deleted", "false").lower() in {"1", "true", "yes"}
-
-    # The repository/service already shapes a pagination dict (items/total/etc.)
-    data = service.list_products(page=page, per_page=per_page, **filters)
-    # list_products returns the raw pagination data (not an envelope); wrap it:
-    envelope = service.ok("Products listed", data=data)
-    return _response(envelope)
+    args = request.args
+    page = args.get("page", default=1, type=int)
+    per_page = min(args.get("per_page", default=20, type=int), MAX_PER_PAGE)
+
+    filters: Dict[str, Any] = {
+        "mine_id": args.get("mine_id", type=int),
+        # name/code are matched by the free-text search
+        "q": args.get("q") or args.get("name") or args.get("code"),
+        "sort_by": args.get("sort_by"),
+        "sort_direction": args.get("sort_dir"),
+        "cursor": args.get("cursor"),
+        "include_deleted": args.get("include_deleted", type=_truthy),
+        "fields": args.get("fields", type=_csv),
+    }
+    filters = {k: v for k, v in filters.items() if v is not None}
+
+    svc = _svc()
+    if "cursor" in filters:
+        # Cursor pages are fetched once each; a whole-set fingerprint would cost more than the page
+        return _response(svc.list(page=page, per_page=per_page, **filters))
+    etag = svc.list_etag(page=page, per_page=per_page, **filters)
+    if _not_modified(etag):
+        return "", HTTPStatus.NOT_MODIFIED, _validator_headers(etag)
+    return _response(svc.list(page=page, per_page=per_page, **filters), etag=etag)
+
+
+@product_bp.get("/stream")
+def stream_products():
+    """
+    GET /api/products/stream?mine_id=<id>[&include_deleted=true]
+    Every product of the mine as NDJSON (one object per line), streamed from a
+    server-side cursor instead of one large page.
+    """
+    mine_id = request.args.get("mine_id", type=int)
+    if mine_id is None:
+        return _response(_svc().validation_error(["Query parameter 'mine_id' is required"]))
+    include_deleted = request.args.get("include_deleted", default=False, type=_truthy)
+    dumps = current_app.json.dumps
+
+    def generate():
+        for item in _svc().iter_by_mine(mine_id, include_deleted=include_deleted):
+            yield dumps(item) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
 @product_bp.get("/<int:product_id>")
@@ -91,8 +138,12 @@ def get_product(product_id: int):
     """
     GET /api/products/<id>
     """
-    envelope = service.get_product(product_id)
-    return _response(envelope)
+    svc = _svc()
+    # Validate before serializing: a matching If-None-Match costs one PK lookup
+    etag = svc.get_etag(product_id)
+    if etag and _not_modified(etag):
+        return "", HTTPStatus.NOT_MODIFIED, _validator_headers(etag)
+    return _response(svc.get(product_id), etag=etag)
 
 
 @product_bp.post("")
@@ -104,12 +155,40 @@ def create_product():
     """
     payload = _json_body()
     if not payload:
-        return _response(service.validation_error(["Request body must be a JSON object"]))
-    envelope = service.create_product(payload)
+        return _response(_svc().validation_error(["Request body must be a JSON object"]))
+    envelope = _svc().create(payload)
     success = HTTPStatus.CREATED if envelope.get("success") else HTTPStatus.BAD_REQUEST
     return _response(envelope, success_code=success)
 
 
+@product_bp.post("/batch")
+def create_products_batch():
+    """
+    POST /api/products/batch
+    Body (JSON): [ { "name": str, "mine_id": int, "code": str?, "description": str? }, ... ]
+    All-or-nothing: one INSERT for the whole batch, or a 400 with per-item errors.
+    """
+    items = request.get_json(silent=True, cache=True)
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        return _response(_svc().validation_error(["Request body must be a JSON array of objects"]))
+    envelope = _svc().create_many(items)
+    return _response(envelope, success_code=HTTPStatus.CREATED)
+
+
+@product_bp.patch("/batch")
+def update_products_batch():
+    """
+    PATCH /api/products/batch
+    Body (JSON): [ { "id": int, "name": str?, "code": str?, "description": str?, "mine_id": int? }, ... ]
+    All-or-nothing: one UPDATE for the whole batch, or a 400 with per-item errors.
+    """
+    items = request.get_json(silent=True, cache=True)
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        return _response(_svc().validation_error(["Request body must be a JSON array of objects"]))
+    envelope = _svc().update_many(items)
+    return _response(envelope)
+
+
 @product_bp.put("/<int:product_id>")
 @product_bp.patch("/<int:product_id>")
 def update_product(product_id: int):
@@ -119,8 +198,8 @@ def update_product(product_id: int):
     """
     payload = _json_body()
     if not payload:
-        return _response(service.validation_error(["Request body must be a JSON object"]))
-    envelope = service.update_product(product_id, payload)
+        return _response(_svc().validation_error(["Request body must be a JSON object"]))
+    envelope = _svc().update(product_id, payload)
     return _response(envelope)
 
 
@@ -129,7 +208,7 @@ def delete_product(product_id: int):
     """
     DELETE /api/products/<id>  (soft delete)
     """
-    envelope = service.delete_product(product_id)
+    envelope = _svc().delete(product_id)
     # 200 OK with envelope (you could also return 204 with no body if you prefer)
     return _response(envelope)
 
@@ -139,6 +218,6 @@ def restore_product(product_id: int):
     """
     POST /api/products/<id>/restore
     """
-    envelope = service.restore_product(product_id)
+    envelope = _svc().restore(product_id)
     return _response(envelope)
 
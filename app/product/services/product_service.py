@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import hashlib
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -8,25 +11,83 @@ from sqlalchemy.orm import Session
 from app.extensions import db
 from app.lib.repository.decorators import transactional
 from app.lib.services.base import BaseService
+from app.models.product import PRODUCT_PAYLOAD_KEYS, Product, product_rows_to_dicts
 from app.product.repository.product_repository import ProductRepository
 
 
+# field -> (type, type error, max length or None, length error); built once at import.
+# Lengths come from the Product columns, so the rules follow the schema.
+_RuleT = Tuple[type, str, Optional[int], Optional[str]]
+
+
+def _compile_field_rules(types: Dict[str, type]) -> Mapping[str, _RuleT]:
+    rules: Dict[str, _RuleT] = {}
+    for field, typ in types.items():
+        max_len = getattr(Product.__table__.c[field].type, "length", None)
+        rules[field] = (
+            typ,
+            f"Field '{field}' must be of type {typ.__name__}",
+            max_len,
+            f"Field '{field}' must contain ≤ {max_len} chars" if max_len else None,
+        )
+    return MappingProxyType(rules)
+
+
+_NAME_TAKEN = "Product name already exists for this mine"
+_CODE_TAKEN = "Product code already exists"
+
+
 class ProductService(BaseService):
     """
     Product service with simple validation and standard envelopes.
     """
 
+    FIELD_RULES = _compile_field_rules({"name": str, "code": str, "description": str, "mine_id": int})
+
     def __init__(self, session: Optional[Session] = None) -> None:
         super().__init__()
-        self.session = session or db.session
-        self.repository = ProductRepository(self.session)
+        self._session = session
+        self.repository = ProductRepository(session)
+
+    @property
+    def session(self) -> Session:
+        return self._session if self._session is not None else db.session
+
+    # ------------------- validation -------------------
+    def _sanitize_and_validate(
+        self, data: Dict[str, Any], *, is_update: bool = False
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Single pass over `data`: trims strings and checks FIELD_RULES as it goes.
+        `name` is required on create and may not be blanked on update.
+        """
+        rules = self.FIELD_RULES
+        clean: Dict[str, Any] = {}
+        errors: List[str] = []
+        for field, value in data.items():
+            if isinstance(value, str):
+                value = value.strip()
+            clean[field] = value
+            rule = rules.get(field)
+            if rule is None or value is None:
+                continue
+            typ, type_error, max_len, length_error = rule
+            if not isinstance(value, typ) or isinstance(value, bool):
+                errors.append(type_error)
+            elif max_len and len(value) > max_len:
+                errors.append(length_error)
+        if (not is_update or "name" in clean) and self._is_empty(clean.get("name")):
+            errors.append("Field 'name' is required")
+        return clean, errors
 
     # ------------------- write ops -------------------
     @transactional
     def create(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        errs = self.validate_required(payload, ["name"])
+        payload, errs = self._sanitize_and_validate(payload)
         if errs:
             return self.validation_error(errs)
+        if self.repository.exists_name(payload["name"], payload.get("mine_id")):
+            return self.validation_error([_NAME_TAKEN])
 
         try:
             entity = self.repository.create(payload)
@@ -37,11 +98,164 @@ class ProductService(BaseService):
 
         return self.ok("Created", data=entity.to_dict())
 
+    @transactional
+    def create_many(self, payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create a batch of products with one INSERT. All-or-nothing: any invalid
+        item rejects the whole batch, with per-item errors.
+        """
+        if not payloads:
+            return self.validation_error(["At least one product is required"])
+
+        errors: List[str] = []
+        cleaned: List[Dict[str, Any]] = []
+        for idx, payload in enumerate(payloads):
+            clean, errs = self._sanitize_and_validate(payload)
+            cleaned.append(clean)
+            errors += [f"Item {idx}: {e}" for e in errs]
+        # The batch checks below assume well-typed items (str names, hashable mine_id/code)
+        if errors:
+            return self.validation_error(errors)
+        payloads = cleaned
+
+        # Duplicates inside the batch, one Counter pass each (names per mine, codes globally)
+        name_counts = Counter(
+            (p.get("mine_id"), p["name"].strip().lower()) for p in payloads if p.get("name")
+        )
+        duplicate_names = sorted({name for (_, name), n in name_counts.items() if n > 1})
+        if duplicate_names:
+            errors.append(f"Duplicate names in batch: {', '.join(duplicate_names)}")
+        code_counts = Counter(p["code"] for p in payloads if p.get("code"))
+        duplicate_codes = sorted(code for code, n in code_counts.items() if n > 1)
+        if duplicate_codes:
+            errors.append(f"Duplicate codes in batch: {', '.join(duplicate_codes)}")
+
+        # Conflicts with stored rows: one query for names, one for codes (not one per item).
+        # Read-only checks: no autoflush of unrelated pending state before the single INSERT.
+        with self.session.no_autoflush:
+            taken_names = self.repository.existing_names(
+                (p.get("mine_id"), p["name"]) for p in payloads if p.get("name")
+            )
+            taken_codes = self.repository.existing_codes(code_counts)
+        for idx, payload in enumerate(payloads):
+            if payload.get("name") and (payload.get("mine_id"), payload["name"]) in taken_names:
+                errors.append(f"Item {idx}: {_NAME_TAKEN}")
+            if payload.get("code") in taken_codes:
+                errors.append(f"Item {idx}: {_CODE_TAKEN}")
+        if errors:
+            return self.validation_error(errors)
+
+        try:
+            entities = self.repository.bulk_create(payloads)
+        except IntegrityError as exc:
+            self.session.rollback()
+            return self.validation_error([f"Integrity error: {exc.orig}"])  # type: ignore[attr-defined]
+
+        return self.ok(
+            "Created",
+            data=Product.to_dict_many(entities),
+            metadata={"total_items": len(entities)},
+        )
+
     @transactional
     def update(self, product_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload, errs = self._sanitize_and_validate(payload, is_update=True)
+        if errs:
+            return self.validation_error(errs)
+        current = self.repository.get(product_id)
+        if current is None:
+            return self.error("Product not found", error_code="NOT_FOUND")
+        # Idempotent PUTs: nothing to check or write when no writable field differs
+        payload = {
+            f: v for f, v in payload.items()
+            if f in self.repository.WRITABLE_FIELDS and getattr(current, f) != v
+        }
+        if not payload:
+            return self.ok("Updated", data=current.to_dict())
+        if payload.get("name"):
+            mine_id = payload.get("mine_id", current.mine_id)
+            if self.repository.exists_name(payload["name"], mine_id, exclude_id=product_id):
+                return self.validation_error([_NAME_TAKEN])
         entity = self.repository.update_fields(product_id, payload)
         return self.ok("Updated", data=entity.to_dict())
 
+    @transactional
+    def update_many(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply partial updates (each item carries "id") with one executemany UPDATE
+        by primary key. All-or-nothing, like create_many.
+        """
+        if not updates:
+            return self.validation_error(["At least one product is required"])
+
+        errors: List[str] = []
+        cleaned: List[Dict[str, Any]] = []
+        for idx, item in enumerate(updates):
+            clean, errs = self._sanitize_and_validate(item, is_update=True)
+            cleaned.append(clean)
+            errors += [f"Item {idx}: {e}" for e in errs]
+        if errors:
+            return self.validation_error(errors)
+        updates = cleaned
+
+        # Validation is read-only: no autoflush before the SELECTs, everything is written by one UPDATE
+        with self.session.no_autoflush:
+            current, errors = self._check_updates(updates)
+        if errors:
+            return self.validation_error(errors)
+
+        try:
+            self.repository.bulk_update_fields(updates)
+        except IntegrityError as exc:  # e.g. a code taken by another product
+            self.session.rollback()
+            return self.validation_error([f"Integrity error: {exc.orig}"])  # type: ignore[attr-defined]
+        # bulk UPDATE by primary key does not touch loaded instances; reload them in one SELECT
+        for entity in current.values():
+            self.session.expire(entity)
+        entities = self.repository.get_by_ids(current)
+        return self.ok(
+            "Updated",
+            data=Product.to_dict_many(entities),
+            metadata={"total_items": len(entities)},
+        )
+
+    def _check_updates(self, updates: List[Dict[str, Any]]) -> tuple[Dict[int, Any], List[str]]:
+        """Load the targeted products and validate update_many items against them."""
+        errors = [f"Item {idx}: Field 'id' is required" for idx, u in enumerate(updates) if not u.get("id")]
+        errors += [
+            f"Item {idx}: Field 'id' must be of type int"
+            for idx, u in enumerate(updates)
+            if u.get("id") and (not isinstance(u["id"], int) or isinstance(u["id"], bool))
+        ]
+        if errors:
+            return {}, errors
+        current = {p.id: p for p in self.repository.get_by_ids(u["id"] for u in updates if u.get("id"))}
+        errors += [
+            f"Item {idx}: Product not found"
+            for idx, u in enumerate(updates)
+            if u.get("id") and u["id"] not in current
+        ]
+        if errors:
+            return current, errors
+
+        # Renames: (mine_id, name) must stay unique within the batch and against other stored rows
+        renamed = {
+            u["id"]: (u.get("mine_id", current[u["id"]].mine_id), u["name"])
+            for u in updates
+            if u.get("name")
+        }
+        name_counts = Counter((mine_id, name.lower()) for mine_id, name in renamed.values())
+        taken = self.repository.existing_names(renamed.values())
+        for idx, u in enumerate(updates):
+            key = renamed.get(u["id"])
+            if key is None:
+                continue
+            if name_counts[(key[0], key[1].lower())] > 1:
+                errors.append(f"Item {idx}: Duplicate name in batch")
+            elif taken.get(key, set()) - {u["id"]}:
+                errors.append(f"Item {idx}: {_NAME_TAKEN}")
+        return current, errors
+
     @transactional
     def delete(self, product_id: int, *, soft: bool = True) -> Dict[str, Any]:
         self.repository.delete(product_id, soft=soft)
@@ -59,15 +273,55 @@ class ProductService(BaseService):
             return self.error("Product not found", error_code="NOT_FOUND")
         return self.ok("OK", data=entity.to_dict())
 
+    def get_etag(self, product_id: int) -> Optional[str]:
+        """Validator for a single product and its embedded mine (None when it does not exist)."""
+        entity = self.repository.get(product_id)
+        if not entity:
+            return None
+        stamps = [entity.updated_at, entity.mine.updated_at if entity.mine else None]
+        return f"{entity.id}:" + ":".join(s.isoformat() if s else "" for s in stamps)
+
+    def iter_by_mine(self, mine_id: int, *, include_deleted: bool = False) -> Iterator[Dict[str, Any]]:
+        """Every product of a mine, serialized chunk by chunk (no page size cap, bounded memory)."""
+        for rows in self.repository.iter_rows_by_mine(mine_id, include_deleted=include_deleted):
+            yield from product_rows_to_dicts(rows)
+
+    def list_etag(self, *, page: int = 1, per_page: int = 20, **filters) -> str:
+        """
+        Validator for a listing: changes whenever a row in the filtered set is
+        updated, added or removed, when a listed product's mine is updated, or
+        when the requested slice changes. Offset pages only: cursor pages are
+        served without a validator.
+        """
+        last_updated, mine_updated, total = self.repository.list_fingerprint(
+            include_deleted=bool(filters.get("include_deleted")),
+            q=filters.get("q"),
+            mine_id=filters.get("mine_id"),
+        )
+        key = f"{last_updated}:{mine_updated}:{total}:{page}:{per_page}:{sorted(filters.items())}"
+        return hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
     def list(self, *, page: int = 1, per_page: int = 20, **filters) -> Dict[str, Any]:
-        page_obj = self.repository.paginate(page=page, per_page=per_page, **filters)
+        fields = filters.get("fields")
+        if fields:
+            unknown = sorted(set(fields) - set(PRODUCT_PAYLOAD_KEYS))
+            if unknown:
+                return self.validation_error([f"Unknown fields: {', '.join(unknown)}"])
+        try:
+            # rows, not ORM instances: the page is only serialized
+            page_obj = self.repository.paginate(page=page, per_page=per_page, as_rows=True, **filters)
+        except ValueError as exc:  # malformed cursor
+            return self.validation_error([str(exc)])
+        metadata = {
+            "total": page_obj.total,
+            "page": page_obj.page,
+            "per_page": page_obj.per_page,
+            "pages": page_obj.pages,
+        }
+        if filters.get("cursor") is not None:
+            metadata.update({"next_cursor": page_obj.next_cursor, "has_more": page_obj.has_more})
         return self.ok(
             "OK",
-            data=[e.to_dict() for e in page_obj.items],
-            metadata={
-                "total": page_obj.total,
-                "page": page_obj.page,
-                "per_page": page_obj.per_page,
-                "pages": page_obj.pages,
-            },
+            data=product_rows_to_dicts(page_obj.items, sparse=bool(fields)),
+            metadata=metadata,
         )
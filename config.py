@@ -1,20 +1,37 @@
 import os
+from functools import lru_cache
+
+# One snapshot of the environment, taken when the config module is first
+# imported (create_app imports it after load_dotenv has run). Every setting
+# below reads from it, so later os.environ mutations do not leak in.
+_ENV = os.environ.copy()
+
+
+def _flag(name: str, default: str) -> bool:
+    return _ENV.get(name, default).lower() in {"1", "true", "yes"}
+
 
 class Config:
     # Core
-    SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret")
-    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///app.db")
+    SECRET_KEY = _ENV.get("SECRET_KEY", "dev-secret")
+    SQLALCHEMY_DATABASE_URI = _ENV.get("DATABASE_URL", "sqlite:///app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Recycle connections the server dropped while idle instead of failing the request
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True}
 
     # JWT / Auth
-    JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", SECRET_KEY)
-    JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
-    JWT_EXPIRES_MINUTES = int(os.environ.get("JWT_EXPIRES_MINUTES", "60"))
+    JWT_SECRET_KEY = _ENV.get("JWT_SECRET_KEY", SECRET_KEY)
+    JWT_ALGORITHM = _ENV.get("JWT_ALGORITHM", "HS256")
+    JWT_EXPIRES_MINUTES = int(_ENV.get("JWT_EXPIRES_MINUTES", "60"))
 
     # CORS / API
-    CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "*")
+    CORS_ORIGINS = _ENV.get("CORS_ORIGINS", "*")
     JSON_SORT_KEYS = False
 
+    # Repositories
+    # Fail fast on unintended lazy loads in product list queries (disable in prod if needed)
+    PRODUCT_REPO_RAISELOAD = _flag("PRODUCT_REPO_RAISELOAD", "true")
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -22,11 +39,16 @@ class DevelopmentConfig(Config):
 
 class TestingConfig(Config):
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = os.environ.get("TEST_DATABASE_URL", "sqlite:///test.db")
+    SQLALCHEMY_DATABASE_URI = _ENV.get("TEST_DATABASE_URL", "sqlite:///test.db")
 
 
 class ProductionConfig(Config):
     DEBUG = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        "pool_size": int(_ENV.get("DB_POOL_SIZE", "20")),
+        "max_overflow": int(_ENV.get("DB_MAX_OVERFLOW", "40")),
+    }
 
 
 config_by_name = {
@@ -35,6 +57,8 @@ config_by_name = {
     "production": ProductionConfig,
 }
 
+@lru_cache(maxsize=1)
 def get_config():
-    return config_by_name.get(os.environ.get("FLASK_ENV", "development"), DevelopmentConfig)
+    # FLASK_ENV comes from the same snapshot as the settings; resolve it once
+    return config_by_name.get(_ENV.get("FLASK_ENV", "development"), DevelopmentConfig)
 
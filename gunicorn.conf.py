@@ -0,0 +1,19 @@
+import os
+
+# Production entrypoint: gunicorn main:app -c gunicorn.conf.py
+# (`python main.py` keeps using the Werkzeug dev server.)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# One process per core pair plus one; threads cover requests blocked on the DB.
+workers = int(os.environ.get("WEB_CONCURRENCY", (2 * (os.cpu_count() or 1)) + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+
+# Import the app once in the master so workers share its pages copy-on-write.
+# create_app() opens no DB connections, so nothing pooled crosses the fork.
+preload_app = True
+
+keepalive = 30
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+accesslog = "-"
@@ -2,13 +2,16 @@ import os
 from dotenv import load_dotenv
 from app import create_app
 
-# Load variables from .env
-load_dotenv()
+# Load variables from .env unless the environment is injected by the caller
+# (tests, process managers); SKIP_DOTENV=1 skips reading the file.
+if os.environ.get('SKIP_DOTENV') != '1':
+    load_dotenv(override=False)
 
 # Creates application from factory
 app = create_app()
 
 if __name__=='__main__':
+    # Development server only; production runs gunicorn main:app -c gunicorn.conf.py
     # Port and optional host
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=app.config.get('DEBUG', True))
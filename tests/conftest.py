@@ -0,0 +1,48 @@
+import pytest
+
+from app import create_app
+from app.auth.utils.jwt import encode_jwt
+from app.extensions import db
+from app.lib.base_model import Base
+from app.models.mine import Mine
+from app.models.product import Product
+from config import TestingConfig
+
+
+class _Config(TestingConfig):
+    # One in-memory database per app (Flask-SQLAlchemy pins it to a single connection)
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
+@pytest.fixture()
+def app():
+    app = create_app(_Config)
+    with app.app_context():
+        Base.metadata.create_all(db.engine, tables=[Mine.__table__, Product.__table__])
+    # No app context is left pushed: each request gets its own, like in production
+    return app
+
+
+@pytest.fixture()
+def client(app):
+    token = encode_jwt({"sub": "test"}, secret=app.config["JWT_SECRET_KEY"])
+    client = app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+@pytest.fixture()
+def make_mine(app):
+    """Inserts a mine directly and returns its id."""
+    def make(name: str, code: str | None = None) -> int:
+        with app.app_context():
+            mine = Mine(name=name, code=code)
+            db.session.add(mine)
+            db.session.commit()
+            return mine.id
+    return make
+
+
+@pytest.fixture()
+def mine_id(make_mine):
+    return make_mine("Mine A", "MA")
@@ -0,0 +1,33 @@
+def test_create_and_update_mine_with_coded_products(client):
+    resp = client.post("/api/mines", json={"name": "Mine B", "products": [{"name": "Fines", "code": "FI-1"}]})
+    assert resp.status_code == 201, resp.get_json()
+    mine_id = resp.get_json()["data"]["id"]
+
+    # The mine's own code matches its product for an update, it is not a conflict
+    resp = client.put(f"/api/mines/{mine_id}", json={"products": [{"code": "FI-1", "description": "washed"}]})
+    assert resp.status_code == 200, resp.get_json()
+
+
+def test_nested_code_of_another_mine_is_rejected(client):
+    resp = client.post("/api/mines", json={"name": "Mine B", "products": [{"name": "Fines", "code": "FI-1"}]})
+    assert resp.status_code == 201, resp.get_json()
+
+    resp = client.post("/api/mines", json={"name": "Mine C", "products": [{"name": "Lump", "code": "FI-1"}]})
+    assert resp.status_code == 400
+    assert "Product 0: Product code already exists" in resp.get_json()["errors"]
+
+
+def test_nested_id_of_another_mine_is_rejected(client):
+    resp = client.post("/api/mines", json={"name": "Mine B", "products": [{"name": "Fines"}]})
+    assert resp.status_code == 201, resp.get_json()
+    resp = client.post("/api/mines", json={"name": "Mine C"})
+    assert resp.status_code == 201, resp.get_json()
+    other_id = resp.get_json()["data"]["id"]
+
+    resp = client.get("/api/products")
+    product_id = resp.get_json()["data"][0]["id"]
+
+    resp = client.put(f"/api/mines/{other_id}", json={"products": [{"id": product_id, "name": "Renamed"}]})
+    assert resp.status_code == 400
+    assert f"Product 0: Product {product_id} does not belong to this mine" in resp.get_json()["errors"]
+    assert client.get("/api/products").get_json()["metadata"]["total"] == 1
@@ -0,0 +1,66 @@
+def test_batch_create_with_codes(client, mine_id):
+    resp = client.post("/api/products/batch", json=[
+        {"name": "Alpha", "code": "AL-1", "mine_id": mine_id},
+        {"name": "Beta", "code": "BE-1", "mine_id": mine_id, "description": "coarse"},
+    ])
+    assert resp.status_code == 201, resp.get_json()
+    data = resp.get_json()["data"]
+    assert sorted(p["code"] for p in data) == ["AL-1", "BE-1"]
+
+    resp = client.post("/api/products/batch", json=[{"name": "Gamma", "code": "AL-1", "mine_id": mine_id}])
+    assert resp.status_code == 400
+    assert "Item 0: Product code already exists" in resp.get_json()["errors"]
+
+
+def test_batch_update_existing_rows(client, mine_id):
+    resp = client.post("/api/products/batch", json=[
+        {"name": "Alpha", "mine_id": mine_id},
+        {"name": "Beta", "mine_id": mine_id},
+    ])
+    assert resp.status_code == 201, resp.get_json()
+    ids = sorted(p["id"] for p in resp.get_json()["data"])
+
+    resp = client.patch("/api/products/batch", json=[
+        {"id": ids[0], "name": "Alpha 2"},
+        {"id": ids[1], "description": "lump"},
+    ])
+    assert resp.status_code == 200, resp.get_json()
+    by_id = {p["id"]: p for p in resp.get_json()["data"]}
+    assert by_id[ids[0]]["name"] == "Alpha 2"
+    assert by_id[ids[1]]["description"] == "lump"
+    assert by_id[ids[0]]["mine"] == {"id": mine_id, "name": "Mine A"}
+
+
+def test_update_missing_product_is_404(client):
+    resp = client.put("/api/products/999", json={"name": "Nope"})
+    assert resp.status_code == 404
+    assert resp.get_json()["error_code"] == "NOT_FOUND"
+
+
+def test_mine_rename_changes_product_etags(client, mine_id):
+    resp = client.post("/api/products", json={"name": "Alpha", "mine_id": mine_id})
+    assert resp.status_code == 201, resp.get_json()
+    product_id = resp.get_json()["data"]["id"]
+    item_etag = client.get(f"/api/products/{product_id}").headers["ETag"]
+    list_etag = client.get("/api/products").headers["ETag"]
+
+    resp = client.put(f"/api/mines/{mine_id}", json={"name": "Mine B"})
+    assert resp.status_code == 200, resp.get_json()
+
+    resp = client.get(f"/api/products/{product_id}", headers={"If-None-Match": item_etag})
+    assert resp.status_code == 200
+    assert resp.get_json()["data"]["mine"]["name"] == "Mine B"
+    resp = client.get("/api/products", headers={"If-None-Match": list_etag})
+    assert resp.status_code == 200
+
+
+def test_sparse_fields_serialize_dates_as_iso(client, mine_id):
+    resp = client.post("/api/products", json={"name": "Alpha", "mine_id": mine_id})
+    assert resp.status_code == 201, resp.get_json()
+    created_at = resp.get_json()["data"]["created_at"]
+
+    resp = client.get("/api/products?fields=id,name&sort_by=created_at")
+    assert resp.status_code == 200, resp.get_json()
+    (item,) = resp.get_json()["data"]
+    assert item["created_at"] == created_at
+    assert "mine" not in item